@@ -25,6 +25,12 @@ def build_parser() -> argparse.ArgumentParser:
         default="planar",
         help="Fallback mode",
     )
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Slicing processes (default: all cores)",
+    )
     p.add_argument("--gui", action="store_true", help="Launch GUI")
     return p
 
@@ -37,7 +43,7 @@ def main(argv: Tuple[str] | None = None) -> None:
         return
     if not (args.input and args.size and args.merged):
         parser.error("--input, --size, --merged required in CLI mode")
-    slice_to_single(args.input, tuple(args.size), args.merged, repair=args.repair)
+    slice_to_single(args.input, tuple(args.size), args.merged, repair=args.repair, workers=args.workers)
     print("Finished →", args.merged)
 
 
@@ -0,0 +1,143 @@
+import os
+import pathlib
+import zipfile
+
+import numpy as np
+import trimesh
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" '
+    'ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    "</Types>"
+)
+_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    "</Relationships>"
+)
+_MODEL_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<model unit="millimeter" xml:lang="en-US" '
+    'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+    "<resources>"
+)
+
+
+class ChunkWriter:
+    """Write named chunks to ``path`` as they are produced.
+
+    The base implementation collects a ``trimesh.Scene`` and exports it on
+    close; subclasses stream formats that allow it so only one chunk is held
+    in memory at a time. Output goes to a temporary file next to ``path``
+    that replaces it only when the ``with`` block succeeds.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        self.count = 0
+        # Keep the suffix, trimesh picks the export format from it
+        self._tmp = self.path.with_name(f".{self.path.stem}.partial{self.path.suffix}")
+        self._scene = trimesh.Scene()
+
+    def add(self, name: str, mesh: trimesh.Trimesh) -> None:
+        self._scene.add_geometry(mesh, node_name=name)
+        self.count += 1
+
+    def _finish(self) -> None:
+        self._scene.export(self._tmp)
+
+    def _discard(self) -> None:
+        pass
+
+    def __enter__(self) -> "ChunkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is not None:
+                self._discard()
+                return
+            if not self.count:
+                raise ValueError("No chunks to export: every grid cell came out empty")
+            self._finish()
+            os.replace(self._tmp, self.path)
+        except BaseException:
+            self._discard()
+            raise
+        finally:
+            self._tmp.unlink(missing_ok=True)
+
+
+class ThreeMFWriter(ChunkWriter):
+    """Stream chunks into the model part of a 3MF package."""
+
+    def __init__(self, path: pathlib.Path):
+        super().__init__(path)
+        self._zip = zipfile.ZipFile(self._tmp, "w", zipfile.ZIP_DEFLATED)
+        self._zip.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        self._zip.writestr("_rels/.rels", _RELS)
+        self._model = self._zip.open("3D/3dmodel.model", "w", force_zip64=True)
+        self._model.write(_MODEL_HEAD.encode())
+
+    def add(self, name: str, mesh: trimesh.Trimesh) -> None:
+        self.count += 1
+        parts = [f'<object id="{self.count}" name="{name}" type="model"><mesh><vertices>']
+        parts.extend(
+            '<vertex x="%.9g" y="%.9g" z="%.9g"/>' % tuple(v) for v in mesh.vertices.tolist()
+        )
+        parts.append("</vertices><triangles>")
+        parts.extend(
+            '<triangle v1="%d" v2="%d" v3="%d"/>' % tuple(f) for f in mesh.faces.tolist()
+        )
+        parts.append("</triangles></mesh></object>")
+        self._model.write("".join(parts).encode())
+
+    def _finish(self) -> None:
+        items = "".join(f'<item objectid="{i}"/>' for i in range(1, self.count + 1))
+        self._model.write(f"</resources><build>{items}</build></model>".encode())
+        self._model.close()
+        self._zip.close()
+
+    def _discard(self) -> None:
+        self._model.close()
+        self._zip.close()
+
+
+class ObjWriter(ChunkWriter):
+    """Stream chunks into an OBJ file as separate objects."""
+
+    def __init__(self, path: pathlib.Path):
+        super().__init__(path)
+        self._offset = 1
+        self._file = open(self._tmp, "w", encoding="utf-8")
+
+    def add(self, name: str, mesh: trimesh.Trimesh) -> None:
+        self.count += 1
+        lines = [f"o {name}\n"]
+        lines.extend("v %.9g %.9g %.9g\n" % tuple(v) for v in mesh.vertices.tolist())
+        faces = np.asarray(mesh.faces) + self._offset
+        lines.extend("f %d %d %d\n" % tuple(f) for f in faces.tolist())
+        self._file.write("".join(lines))
+        self._offset += len(mesh.vertices)
+
+    def _finish(self) -> None:
+        self._file.close()
+
+    def _discard(self) -> None:
+        self._file.close()
+
+
+def open_writer(path: pathlib.Path) -> ChunkWriter:
+    """Return a chunk writer suited to the extension of ``path``."""
+    suffix = pathlib.Path(path).suffix.lower()
+    if suffix == ".3mf":
+        return ThreeMFWriter(path)
+    if suffix == ".obj":
+        return ObjWriter(path)
+    return ChunkWriter(path)
@@ -1,11 +1,10 @@
 import pathlib
 import sys
 import threading
+import time
 from tkinter import filedialog, messagebox, ttk
 import tkinter as tk
 
-import trimesh
-
 from .core import slice_to_single
 from .preview import create_preview_scene
 
@@ -90,15 +89,20 @@ def launch_gui():
                 mp = pathlib.Path(in_e.get())
                 op = pathlib.Path(out_e.get())
                 cell = (float(sx.get()), float(sy.get()), float(sz.get()))
-                prog["value"] = 0
+                root.after(0, lambda: prog.config(value=0))
+                last = [0.0]
 
                 def cb(d, t):
-                    prog.config(maximum=t, value=d)
-
-                slice_to_single(mp, cell, op, repair=rep_var.get(), progress=cb)
-                mesh = trimesh.load_mesh(mp, force="mesh")
-                vol = mesh.volume
-                area = mesh.area
+                    # At most ~60 updates/s, handed over to the Tk thread
+                    now = time.monotonic()
+                    if now - last[0] < 0.016 and d < t:
+                        return
+                    last[0] = now
+                    root.after(0, lambda: prog.config(maximum=t, value=d))
+
+                res = slice_to_single(mp, cell, op, repair=rep_var.get(), progress=cb)
+                vol = res.volume
+                area = res.area
                 infill = 0.10
                 perimeters = 2
                 line_width = 0.4
@@ -113,10 +117,10 @@ def launch_gui():
                 messagebox.showinfo(
                     "Grid Split", f"Saved → {op}\nEstimated print time: {time_str}"
                 )
-                prog["value"] = 0
+                root.after(0, lambda: prog.config(value=0))
             except Exception as e:
                 messagebox.showerror("Slice Error", str(e))
-                prog["value"] = 0
+                root.after(0, lambda: prog.config(value=0))
 
         threading.Thread(target=worker, daemon=True).start()
 
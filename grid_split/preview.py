@@ -6,25 +6,24 @@ import trimesh
 
 from .core import RULER_STEP_MM, TICK_SIZE_RATIO
 
+PLANE_COLOR = [200, 50, 50, 80]
 
-def _plane_mesh(axis: str, coord: float, bounds: np.ndarray) -> trimesh.Trimesh:
+
+def _plane_meshes(axis: int, coords: np.ndarray, bounds: np.ndarray) -> trimesh.Trimesh:
+    """Thin boxes marking the cut planes at ``coords`` along ``axis``."""
     min_pt, max_pt = bounds
     thickness = (max_pt - min_pt).max() * 0.002
-    if axis == "x":
-        cmin = [coord - thickness, min_pt[1], min_pt[2]]
-        cmax = [coord + thickness, max_pt[1], max_pt[2]]
-    elif axis == "y":
-        cmin = [min_pt[0], coord - thickness, min_pt[2]]
-        cmax = [max_pt[0], coord + thickness, max_pt[2]]
-    else:
-        cmin = [min_pt[0], min_pt[1], coord - thickness]
-        cmax = [max_pt[0], max_pt[1], coord + thickness]
-    box = trimesh.creation.box(
-        extents=np.array(cmax) - np.array(cmin),
-        transform=trimesh.transformations.translation_matrix((np.array(cmin) + np.array(cmax)) / 2),
-    )
-    box.visual.face_colors = [200, 50, 50, 80]
-    return box
+    extents = max_pt - min_pt
+    extents[axis] = 2 * thickness
+    # Every plane on an axis is the same box, only shifted along that axis
+    template = trimesh.creation.box(extents=extents)
+    centers = np.tile((min_pt + max_pt) * 0.5, (len(coords), 1))
+    centers[:, axis] = coords
+    n_verts = len(template.vertices)
+    vertices = (template.vertices[None] + centers[:, None]).reshape(-1, 3)
+    offsets = n_verts * np.arange(len(coords))
+    faces = (template.faces[None] + offsets[:, None, None]).reshape(-1, 3)
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
 
 
 def _axis_ruler(bounds: np.ndarray, axis: int, color: Tuple[int, int, int]) -> trimesh.path.Path3D:
@@ -32,23 +31,15 @@ def _axis_ruler(bounds: np.ndarray, axis: int, color: Tuple[int, int, int]) -> t
     length = max_pt[axis] - min_pt[axis]
     tick_len = length * TICK_SIZE_RATIO
     steps = int(length // RULER_STEP_MM) + 1
-    lines = []
-    for i in range(steps):
-        coord = min_pt[axis] + i * RULER_STEP_MM
-        if axis == 0:
-            start, end = [coord, min_pt[1], min_pt[2]], [coord, min_pt[1], min_pt[2] + tick_len]
-        elif axis == 1:
-            start, end = [min_pt[0], coord, min_pt[2]], [min_pt[0] + tick_len, coord, min_pt[2]]
-        else:
-            start, end = [min_pt[0], min_pt[1], coord], [min_pt[0] + tick_len, min_pt[1], coord]
-        lines.append([start, end])
-    if axis == 0:
-        lines.append([[min_pt[0], min_pt[1], min_pt[2]], [max_pt[0], min_pt[1], min_pt[2]]])
-    elif axis == 1:
-        lines.append([[min_pt[0], min_pt[1], min_pt[2]], [min_pt[0], max_pt[1], min_pt[2]]])
-    else:
-        lines.append([[min_pt[0], min_pt[1], min_pt[2]], [min_pt[0], min_pt[1], max_pt[2]]])
-    path = trimesh.load_path(np.array(lines))
+    # Ticks stand along Z for the X ruler and along X for the others
+    tick_dir = 2 if axis == 0 else 0
+    lines = np.empty((steps + 1, 2, 3))
+    lines[:] = min_pt
+    lines[:steps, :, axis] = (min_pt[axis] + np.arange(steps) * RULER_STEP_MM)[:, None]
+    lines[:steps, 1, tick_dir] += tick_len
+    # The last segment is the ruler itself
+    lines[steps, 1, axis] = max_pt[axis]
+    path = trimesh.load_path(lines)
     rgba = np.array([*color, 255])
     path.colors = np.tile(rgba, (len(path.entities), 1))
     return path
@@ -57,12 +48,16 @@ def _axis_ruler(bounds: np.ndarray, axis: int, color: Tuple[int, int, int]) -> t
 def create_preview_scene(model_path: pathlib.Path, cell: Tuple[float, float, float]) -> trimesh.Scene:
     mesh = trimesh.load_mesh(model_path, force="mesh")
     scene = trimesh.Scene(mesh)
-    for x in np.arange(mesh.bounds[0][0] + cell[0], mesh.bounds[1][0], cell[0]):
-        scene.add_geometry(_plane_mesh("x", x, mesh.bounds))
-    for y in np.arange(mesh.bounds[0][1] + cell[1], mesh.bounds[1][1], cell[1]):
-        scene.add_geometry(_plane_mesh("y", y, mesh.bounds))
-    for z in np.arange(mesh.bounds[0][2] + cell[2], mesh.bounds[1][2], cell[2]):
-        scene.add_geometry(_plane_mesh("z", z, mesh.bounds))
+    planes = []
+    for axis in range(3):
+        coords = np.arange(mesh.bounds[0][axis] + cell[axis], mesh.bounds[1][axis], cell[axis])
+        if len(coords):
+            planes.append(_plane_meshes(axis, coords, mesh.bounds))
+    if planes:
+        # One combined mesh means a single buffer upload in the viewer
+        combined = trimesh.util.concatenate(planes)
+        combined.visual.face_colors = np.tile(PLANE_COLOR, (len(combined.faces), 1))
+        scene.add_geometry(combined, node_name="cut_planes")
     scene.add_geometry(_axis_ruler(mesh.bounds, 0, (255, 0, 0)))
     scene.add_geometry(_axis_ruler(mesh.bounds, 1, (0, 255, 0)))
     scene.add_geometry(_axis_ruler(mesh.bounds, 2, (0, 0, 255)))
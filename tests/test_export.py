@@ -0,0 +1,52 @@
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+
+from grid_split.export import open_writer  # noqa: E402
+
+
+def _chunks():
+    a = trimesh.creation.box(extents=(1, 2, 3))
+    b = trimesh.creation.box(extents=(2, 2, 2))
+    b.apply_translation((10, 0, 0))
+    return {"chunk_0_0_0": a, "chunk_1_0_0": b}
+
+
+def _round_trip(path, **load_kwargs):
+    chunks = _chunks()
+    with open_writer(path) as writer:
+        for name, mesh in chunks.items():
+            writer.add(name, mesh)
+    assert writer.count == len(chunks)
+    scene = trimesh.load(path, force="scene", **load_kwargs)
+    loaded = sorted(g.volume for g in scene.geometry.values())
+    expected = sorted(m.volume for m in chunks.values())
+    assert loaded == pytest.approx(expected)
+
+
+def test_3mf_round_trip(tmp_path):
+    pytest.importorskip("lxml")
+    pytest.importorskip("networkx")
+    _round_trip(tmp_path / "out.3mf")
+
+
+def test_obj_round_trip(tmp_path):
+    _round_trip(tmp_path / "out.obj", split_object=True, group_material=False)
+
+
+@pytest.mark.parametrize("suffix", [".3mf", ".obj", ".stl"])
+def test_empty_output_raises(tmp_path, suffix):
+    path = tmp_path / f"out{suffix}"
+    with pytest.raises(ValueError):
+        with open_writer(path):
+            pass
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failure_discards_output(tmp_path):
+    path = tmp_path / "out.3mf"
+    with pytest.raises(RuntimeError):
+        with open_writer(path) as writer:
+            writer.add("chunk_0_0_0", _chunks()["chunk_0_0_0"])
+            raise RuntimeError
+    assert list(tmp_path.iterdir()) == []